@@ -1 +1 @@
-__all__ = ['test_action', 'test_tinyrpg', 'test_world', 'util']
+__all__ = ['test_action', 'test_gui', 'test_plot', 'test_resource', 'test_tinyrpg', 'test_world', 'util']
@@ -1,5 +1,4 @@
-from unittest.mock import *
-from nose.tools import raises
+from unittest.mock import Mock, call
 
 from tinyrpg.action import *
 from tinyrpg.world import Entity, World
@@ -7,7 +6,7 @@ from tinyrpg.world import Entity, World
 
 class TestActionIter(object):
 
-    def TestCall_NumCallsIsLTNumActions_CallOnlyNextAction(self):
+    def testCall_NumCallsIsLTNumActions_CallOnlyNextAction(self):
         action1 = Mock(spec=AbstractAction)
         action2 = Mock(spec=AbstractAction, side_effect=AssertionError)
         actioniter = ActionIter(action1, action2)
@@ -16,7 +15,7 @@ class TestActionIter(object):
         actioniter(world, entity)
         action1.assert_called_once_with(world, entity)
 
-    def TestCall_NumCallsIsGTENumActions_CallFinalAction(self):
+    def testCall_NumCallsIsGTENumActions_CallFinalAction(self):
         action = Mock(spec=AbstractAction)
         actioniter = ActionIter(action)
         world, entity = object(), object()
@@ -28,7 +27,7 @@ class TestActionIter(object):
 
 class TestActionLoop(object):
 
-    def TestCall_NumCallsExceedsNumActions_LoopAround(self):
+    def testCall_NumCallsExceedsNumActions_LoopAround(self):
         actions = [Mock(spec=AbstractAction) for i in range(3)]
         actionloop = ActionLoop(*actions)
         world, entity = object(), object()
@@ -43,7 +42,7 @@ class TestActionLoop(object):
 
 class TestActionCycle(object):
 
-    def TestCall_NumCallsLTNumActions_CallOnlyNextAction(self):
+    def testCall_NumCallsLTNumActions_CallOnlyNextAction(self):
         action1 = Mock(spec=AbstractAction)
         action2 = Mock(spec=AbstractAction, side_effect=AssertionError)
         actioncycle = ActionCycle(2, action1, action2)
@@ -52,7 +51,7 @@ class TestActionCycle(object):
         actioncycle(world, entity)
         action1.assert_called_once_with(world, entity)
 
-    def TestCall_NumCallsExceedsNumActions_LoopAround(self):
+    def testCall_NumCallsExceedsNumActions_LoopAround(self):
         actions = [Mock(spec=AbstractAction) for i in range(3)]
         actioncycle = ActionCycle(2, *actions)
         world, entity = object(), object()
@@ -64,10 +63,21 @@ class TestActionCycle(object):
         assert actions[1].call_count == 2
         assert actions[2].call_count == 1
 
+    def testCall_NumCallsExceedsNTimesNumActions_CallFinalAction(self):
+        actions = [Mock(spec=AbstractAction) for i in range(2)]
+        actioncycle = ActionCycle(2, *actions)
+        world, entity = object(), object()
+
+        for i in range(6):
+            actioncycle(world, entity)
+
+        assert actions[0].call_count == 2
+        assert actions[1].call_count == 4
+
 
 class TestActionSequence(object):
 
-    def TestCall_CallAllActions(self):
+    def testCall_CallAllActions(self):
         actions = [Mock(spec=AbstractAction) for i in range(2)]
         actionseq = ActionSequence(*actions)
         world, entity = object(), object()
@@ -77,10 +87,63 @@ class TestActionSequence(object):
         assert actions[0].call_count == 3
         assert actions[1].call_count == 3
 
+    def testCall_AnyNumActions_CallAllActionsInOrder(self):
+        world, entity = object(), object()
+        for n in range(1, 6):
+            manager = Mock()
+            actions = [getattr(manager, 'action%d' % i) for i in range(n)]
+            actionseq = ActionSequence(*actions)
+
+            actionseq(world, entity)
+            assert isinstance(actionseq, ActionSequence)
+            assert manager.mock_calls == [
+                getattr(call, 'action%d' % i)(world, entity)
+                for i in range(n)]
+
+    def testClass_SubclassTakesKwargs_PassKwargsToSubclassInit(self):
+        class NamedSequence(ActionSequence):
+            def __init__(self, *actions, name=None):
+                super(NamedSequence, self).__init__(*actions)
+                self.name = name
+
+        actions = [Mock(spec=AbstractAction) for i in range(2)]
+        actionseq = NamedSequence(*actions, name='dance')
+        world, entity = object(), object()
+
+        actionseq(world, entity)
+        assert type(actionseq) is NamedSequence
+        assert actionseq.name == 'dance'
+        actions[0].assert_called_once_with(world, entity)
+        actions[1].assert_called_once_with(world, entity)
+
+
+class TestMakeSequence(object):
+
+    def testCall_MoveThenAlertGiven_StepEntityThenWriteText(self):
+        text = "You hear a click."
+        seq = make_sequence(Move(1, 0), Alert(text))
+        world = Mock()
+        entity = object()
+
+        seq(world, entity)
+        assert world.mock_calls == [
+            call.focus.step_entity(entity, 1, 0),
+            call.infobox.write(text)]
+
+    def testCall_UnknownCombinationGiven_ReturnActionSequence(self):
+        actions = [Mock(spec=AbstractAction) for i in range(2)]
+        seq = make_sequence(*actions)
+        world, entity = object(), object()
+
+        seq(world, entity)
+        assert isinstance(seq, ActionSequence)
+        actions[0].assert_called_once_with(world, entity)
+        actions[1].assert_called_once_with(world, entity)
+
 
 class TestResetAction(object):
 
-    def TestCall_SetEntityActionToGivenAction(self):
+    def testCall_SetEntityActionToGivenAction(self):
         newaction = Mock(spec=AbstractAction)
         resetaction = ResetAction(newaction)
         world = object()
@@ -89,7 +152,7 @@ class TestResetAction(object):
         resetaction(world, entity)
         assert entity.action is newaction
 
-    def TestCall_CallGivenActionWithGivenWorldAndEntity(self):
+    def testCall_CallGivenActionWithGivenWorldAndEntity(self):
         newaction = Mock(spec=AbstractAction)
         resetaction = ResetAction(newaction)
         world = object()
@@ -101,7 +164,7 @@ class TestResetAction(object):
 
 class TestUpdatePlot(object):
 
-    def TestCall_UpdateGivenWorldWithGivenPlotUpdates(self):
+    def testCall_UpdateGivenWorldWithGivenPlotUpdates(self):
         updates = (Mock(), Mock())
         updateplot = UpdatePlot(*updates)
         world = Mock()
@@ -113,7 +176,7 @@ class TestUpdatePlot(object):
 
 class TestAlert(object):
 
-    def TestCall_WriteGivenTextToGivenWorldInfobox(self):
+    def testCall_WriteGivenTextToGivenWorldInfobox(self):
         text = "Danger approaches!"
         alert = Alert(text)
         world = Mock()
@@ -125,7 +188,7 @@ class TestAlert(object):
 
 class TestTalk(object):
 
-    def TestCall_WriteTextPrefixedByEntityNameToWorldInfobox(self):
+    def testCall_WriteTextPrefixedByEntityNameToWorldInfobox(self):
         text = "Nice to meet you."
         talk = Talk(text)
         world = Mock()
@@ -139,10 +202,21 @@ class TestTalk(object):
         talk(world, entity)
         world.infobox.write.assert_called_once_with(name + sep + text)
 
+    def testCall_EntityNameGiven_WriteTextPrefixedByGivenName(self):
+        text = "Halt!"
+        name = "Guard"
+        talk = Talk(text, name)
+        world = Mock()
+        entity = Mock()
+        entity.name = "Earl"
+
+        talk(world, entity)
+        world.infobox.write.assert_called_once_with(name + Talk.sep + text)
+
 
 class TestMove(object):
 
-    def TestCall_StepGivenEntityGivenDistance(self):
+    def testCall_StepGivenEntityGivenDistance(self):
         xstep = 3
         ystep = 2
         move = Move(xstep, ystep)
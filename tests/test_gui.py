@@ -0,0 +1,98 @@
+from unittest.mock import Mock
+
+import pyglet
+
+from tinyrpg.gui import *
+
+
+class TestInfoBox(object):
+
+    def make_infobox(self):
+        return InfoBox(0, 0, 200, 100, pyglet.graphics.Batch())
+
+    def testWriteMany_GivenLines_WriteSameTextAsSuccessiveWrites(self):
+        lines = ['You enter the cellar.', 'It is dark.', 'You hear a drip.']
+        written = self.make_infobox()
+        for line in lines:
+            written.write(line)
+
+        infobox = self.make_infobox()
+        infobox.write_many(lines)
+        assert infobox.document.text == written.document.text
+
+    def testWriteMany_GivenGenerator_WriteEachLine(self):
+        lines = ['north', 'south']
+        infobox = self.make_infobox()
+        infobox.write_many(line for line in lines)
+        assert infobox.document.text == '> south\n> north\n '
+
+
+class TestMenu(object):
+
+    def make_menu(self, n=3):
+        return Menu(0, 0, 200, 300, pyglet.graphics.Batch(),
+                    ['item%d' % i for i in range(n)],
+                    [Mock() for i in range(n)], margin=10, padding=10)
+
+    def testClass_GivenItems_StackItemBoundsFromTheTop(self):
+        menu = self.make_menu()
+        assert menu._bounds == [
+            (10, 210, 190, 290), (10, 110, 190, 190), (10, 10, 190, 90)]
+
+    def testClass_GivenItems_CentreLabelsInItemBoxes(self):
+        menu = self.make_menu()
+        centres = [(label.x, label.y) for label in menu.labels]
+        assert centres == [(100, 250), (100, 150), (100, 50)]
+        assert [label.text for label in menu.labels] == [
+            'item0', 'item1', 'item2']
+
+    def testClass_SelectFirstItem(self):
+        menu = self.make_menu()
+        assert menu.selection == 0
+        assert menu.boxes[0].visible
+
+    def testOnMouseMotion_MouseOverItem_SelectItem(self):
+        menu = self.make_menu()
+
+        menu.on_mouse_motion(50, 150, 0, 0)
+        assert menu.selection == 1
+        assert menu.boxes[1].visible
+        assert not menu.boxes[0].visible
+
+    def testOnMouseMotion_MouseOutsideItems_DeselectItem(self):
+        menu = self.make_menu()
+
+        menu.on_mouse_motion(50, 100, 0, 0)
+        assert menu.selection is None
+        assert not any(box.visible for box in menu.boxes)
+
+    def testSelectNext_NoItemSelected_SelectFirstItem(self):
+        menu = self.make_menu()
+        menu.select_item(None)
+
+        menu.select_next()
+        assert menu.selection == 0
+
+    def testSelectNext_LastItemSelected_WrapToFirstItem(self):
+        menu = self.make_menu()
+        menu.select_item(-1)
+        assert menu.selection == 2
+
+        menu.select_next()
+        assert menu.selection == 0
+        assert not menu.boxes[2].visible
+
+    def testSelectPrev_NoItemSelected_SelectLastItem(self):
+        menu = self.make_menu()
+        menu.select_item(None)
+
+        menu.select_prev()
+        assert menu.selection == 2
+
+    def testSelectPrev_FirstItemSelected_WrapToLastItem(self):
+        menu = self.make_menu()
+
+        menu.select_prev()
+        assert menu.selection == 2
+        assert menu.boxes[2].visible
+        assert not menu.boxes[0].visible
@@ -0,0 +1,103 @@
+from unittest.mock import Mock
+
+from tinyrpg.plot import Plot, plot
+
+
+def start_plot(world, state, triggers):
+    plt = plot(world, state, triggers)
+    next(plt)
+    return plt
+
+
+class TestPlot(object):
+
+    def testSend_UpdatesSatisfyTrigger_CallTriggerFuncWithWorld(self):
+        world = object()
+        func = Mock()
+        plt = start_plot(world, set(), {
+            frozenset(['a', 'b']): (func, {}),
+            frozenset(['c']): (Mock(), {})})
+
+        plt.send(('a', 'b'))
+        func.assert_called_once_with(world)
+
+    def testSend_UpdatesPartlySatisfyTrigger_DontCallTriggerFunc(self):
+        func = Mock()
+        other = Mock()
+        plt = start_plot(object(), set(), {
+            frozenset(['a', 'b']): (func, {}),
+            frozenset(['c']): (other, {})})
+
+        plt.send(('a',))
+        plt.send('c')
+        assert not func.called
+
+    def testSend_TriggerAlreadyFired_DontCallTriggerFuncAgain(self):
+        func = Mock()
+        other = Mock()
+        plt = start_plot(object(), set(), {
+            frozenset(['a']): (func, {}),
+            frozenset(['b']): (other, {})})
+
+        plt.send(('a',))
+        plt.send(('a',))
+        assert func.call_count == 1
+
+    def testSend_TriggerHasNestedTriggers_EnableNestedTriggers(self):
+        world = object()
+        nested = Mock()
+        plt = start_plot(world, set(), {
+            frozenset(['a']): (Mock(), {frozenset(['b']): (nested, {})}),
+            frozenset(['c']): (Mock(), {})})
+
+        plt.send(('b',))
+        assert not nested.called
+        plt.send(('a',))
+        nested.assert_called_once_with(world)
+
+    def testSend_TriggerRequiresNoElements_CallTriggerFuncOnFirstUpdate(self):
+        world = object()
+        func = Mock()
+        other = Mock()
+        plt = start_plot(world, set(), {
+            frozenset(): (func, {}),
+            frozenset(['z']): (other, {})})
+
+        plt.send(('a',))
+        func.assert_called_once_with(world)
+        plt.send(('b',))
+        assert func.call_count == 1
+        assert not other.called
+
+    def testSend_InitialStateSatisfiesTrigger_CallFuncOnFirstUpdate(self):
+        world = object()
+        func = Mock()
+        other = Mock()
+        plt = start_plot(world, {'a'}, {
+            frozenset(['a']): (func, {}),
+            frozenset(['q']): (other, {})})
+
+        plt.send(('x',))
+        func.assert_called_once_with(world)
+        plt.send(('y',))
+        assert func.call_count == 1
+        assert not other.called
+
+
+class TestPlotClass(object):
+
+    def testUpdate_NestedTriggersGivenAsTuplesAndCallables_CallInOrder(self):
+        world = object()
+        first = Mock()
+        second = Mock()
+        plt = Plot(set(), {
+            ('a', 'b'): (first, {
+                ('c',): second}),
+            ('z',): Mock()})
+        plt.start(world)
+
+        plt.update('a', 'c')
+        assert not first.called
+        plt.update('b')
+        first.assert_called_once_with(world)
+        second.assert_called_once_with(world)
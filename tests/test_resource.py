@@ -0,0 +1,55 @@
+from tests.util import IMAGE_PATH
+from tinyrpg.resource import Loader
+
+
+def make_loader():
+    return Loader([IMAGE_PATH], script_home='.')
+
+
+def corners(image):
+    coords = image.tex_coords
+    return {coords[i:i + 3] for i in range(0, len(coords), 3)}
+
+
+class TestLoader(object):
+
+    def testImage_SizeOmitted_ReturnParentImage(self):
+        loader = make_loader()
+        image = loader.image('sack.png')
+        assert image is super(Loader, loader).image('sack.png')
+        assert not loader._scaled_images
+
+    def testImage_SizeGiven_ScaleImage(self):
+        image = make_loader().image('sack.png', 16, 8)
+        assert (image.width, image.height) == (16, 8)
+
+    def testImage_SizeGiven_LeaveUnscaledImageAlone(self):
+        loader = make_loader()
+        loader.image('sack.png', 16, 8)
+        image = loader.image('sack.png')
+        assert (image.width, image.height) == (8, 8)
+
+    def testImage_SameArgsGivenTwice_ReturnCachedImage(self):
+        loader = make_loader()
+        image = loader.image('sack.png', 16, 8, flip_x=True)
+        assert loader.image('sack.png', 16, 8, flip_x=True) is image
+        assert loader.image('sack.png', 16, 8) is not image
+
+    def testImage_FlipXGiven_AnchorScaledImageAtRightEdge(self):
+        image = make_loader().image('sack.png', 16, 8, flip_x=True)
+        assert (image.width, image.height) == (16, 8)
+        assert (image.anchor_x, image.anchor_y) == (16, 0)
+
+    def testImage_RotateGiven_ScaleRotatedImageToGivenSize(self):
+        loader = make_loader()
+        unscaled = loader.image('sack.png')
+        image = loader.image('sack.png', 16, 8, rotate=90)
+        assert (image.width, image.height) == (16, 8)
+        assert (image.anchor_x, image.anchor_y) == (0, 8)
+        assert corners(image) == corners(unscaled)
+
+    def testReindex_ForgetScaledImages(self):
+        loader = make_loader()
+        loader.image('sack.png', 16, 8)
+        loader.reindex()
+        assert not loader._scaled_images
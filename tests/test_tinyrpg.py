@@ -1,11 +1,11 @@
-from unittest.mock import *
+from unittest.mock import Mock, patch
 
 import pyglet
 
 from tinyrpg import *
 from tinyrpg.base import GameMode
 
-def TestRunGame_GamemodeHasActivateMethod_CallActivateAndRunEventLoop():
+def testRunGame_GamemodeHasActivateMethod_CallActivateAndRunEventLoop():
     gamemode = Mock(spec=GameMode)
     with patch.object(pyglet.app, 'run'):
         run_game(gamemode)
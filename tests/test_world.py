@@ -1,12 +1,14 @@
 import pyglet
-from unittest.mock import *
+import pytest
+from pyglet.window import key
+from unittest.mock import Mock, MagicMock, PropertyMock, patch
 
 from tests.util import dummy_image
 from tinyrpg.world import *
 
 class TestEntity(object):
 
-    def TestClass_AllArgsGiven_SetExpectedInstanceAttrs(self):
+    def testClass_AllArgsGiven_SetExpectedInstanceAttrs(self):
         image = dummy_image()
         name = 'Dude'
         walkable = False
@@ -26,7 +28,7 @@ class TestEntity(object):
         assert entity.tile_y == y
         assert entity.tile_z == z
 
-    def TestClass_NoKwargsGiven_SetExpectedInstanceAttrs(self):
+    def testClass_NoKwargsGiven_SetExpectedInstanceAttrs(self):
         image = dummy_image()
         entity = Entity(image)
         assert entity.name == ''
@@ -38,10 +40,23 @@ class TestEntity(object):
         assert entity.tile_y == 0
         assert entity.tile_z == 0
 
+    def testUpdate_GivenTileCoords_PositionEntityAtOffsetTile(self):
+        entity = Entity(dummy_image())
+        entity.update(2, 3, 1, 10, 20, 8, 16)
+        assert entity.tile_pos == (2, 3, 1)
+        assert (entity.x, entity.y) == (2 * 8 + 10, 3 * 16 + 20)
+
+    def testUpdate_EntitiesOnSameZ_ShareGroup(self):
+        entity1 = Entity(dummy_image())
+        entity2 = Entity(dummy_image())
+        entity1.update(0, 0, 4)
+        entity2.update(1, 0, 4)
+        assert entity1.group is entity2.group
+
 
 class TestRoom(object):
 
-    def TestClass_AllArgsGiven_SetExpectedInstanceAttrs(self):
+    def testClass_AllArgsGiven_SetExpectedInstanceAttrs(self):
         name = 'The Room'
         entities = portals = MagicMock()
         origin_x = 15
@@ -58,7 +73,7 @@ class TestRoom(object):
         assert room.tile_width == tile_width
         assert room.tile_height == tile_height
 
-    def TestClass_TileAndOriginArgsOmitted_SetToGlobalConstants(self):
+    def testClass_TileAndOriginArgsOmitted_SetToGlobalConstants(self):
         name = entities = portals = MagicMock()
         room = Room(name, entities, portals)
 
@@ -67,14 +82,14 @@ class TestRoom(object):
         assert room.tile_width == TILE_WIDTH
         assert room.tile_height == TILE_HEIGHT
 
-    def TestClass_CallAddPortalsOnGivenPortals(self):
+    def testClass_CallAddPortalsOnGivenPortals(self):
         name = entities = MagicMock()
         portals = MagicMock()
         with patch.object(Room, 'add_portals'):
             room = Room(name, entities, portals)
             room.add_portals.assert_called_once_with(portals)
 
-    def TestClass_IndexEntitiesByIdAttr(self):
+    def testClass_IndexEntitiesByIdAttr(self):
         e0 = Mock(id=0)
         e1 = Mock(id=1)
         e2 = Mock(id=2)
@@ -87,6 +102,12 @@ class TestRoom(object):
         room = Room(name, entities, portals)
         assert room.uniques == {1: e1, 2: e2, 3: e3}
 
+    def testClass_RowsDifferInLength_RaiseValueError(self):
+        entities = [[[Mock()], [Mock()]],
+                    [[Mock()]]]
+        with pytest.raises(ValueError):
+            Room('crooked house', entities, MagicMock())
+
     def iter_entities(self, entities):
         for y, row in enumerate(entities):
             for x, cell in enumerate(row):
@@ -94,7 +115,7 @@ class TestRoom(object):
                     if entity:
                         yield entity, x, y, z
 
-    def TestIterEntities_ForEachEntityThatTestsTrue_YieldEntityAndCoords(self):
+    def testIterEntities_ForEachEntityThatTestsTrue_YieldEntityAndCoords(self):
         name = portals = MagicMock()
         entities = [
             [[Mock()], [Mock()]],
@@ -107,7 +128,18 @@ class TestRoom(object):
             yielded = next(iter_ents) 
             assert yielded == (entity, x, y, z)
 
-    def TestUpdateEntity_ValidZCoordGiven_SetGroupOrderToZ(self):
+    def testIterEntities_EntitiesAddedAndPopped_YieldOnlyCurrentEntities(self):
+        kept, popped, added = Mock(), Mock(), Mock()
+        entities = [[[kept, popped], [None]]]
+        portals = MagicMock()
+        room = Room('dance hall', entities, portals)
+
+        room.pop_entity(0, 0, 1)
+        room.add_entity(added, 1, 0, 0)
+        assert sorted(room._iter_entities(), key=lambda t: t[1:]) == [
+            (kept, 0, 0, 0), (added, 1, 0, 0)]
+
+    def testUpdateEntity_ValidZCoordGiven_SetGroupOrderToZ(self):
         mockarg = MagicMock()
         room = Room('disco hall', mockarg, mockarg)
 
@@ -120,18 +152,69 @@ class TestRoom(object):
             x, y, z, room.origin_x, room.origin_y, room.tile_width,
             room.tile_height, room.batch)
 
-    def TestUpdate_CallUpdateEntityOnAllEntities(self):
+    def testUpdate_UpdateAllEntitiesWithRoomLayout(self):
         entities = [[[Mock()]],
                     [[Mock()]]]
         portals = MagicMock()
         room = Room('jazz lounge', entities, portals)
 
-        with patch.object(room, '_update_entity'):
-            room.update()
-            for entity, x, y, z in self.iter_entities(entities):
-                room._update_entity.assert_any_call(entity, x, y, z)
+        room.update()
+        for entity, x, y, z in self.iter_entities(entities):
+            entity.update.assert_called_once_with(
+                x, y, z, room.origin_x, room.origin_y, room.tile_width,
+                room.tile_height, room.batch)
     
-    def TestIsWalkable_AllEntitiesAtGivenXYAreWalkable_ReturnTrue(self):
+    def testUpdate_RoomUnchangedSinceLastUpdate_DontUpdateEntities(self):
+        entity = Mock()
+        room = Room('blues bar', [[[entity]]], MagicMock())
+
+        room.update()
+        room.update()
+        assert entity.update.call_count == 1
+
+    def testUpdate_BatchChangedSinceLastUpdate_UpdateEntities(self):
+        entity = Mock()
+        room = Room('soul kitchen', [[[entity]]], MagicMock())
+
+        room.update()
+        room.batch = Mock()
+        room.update()
+        assert entity.update.call_count == 2
+
+    def testAttachBatch_RoomUnchangedSinceLastUpdate_OnlySetEntityBatch(self):
+        entity = Mock()
+        room = Room('funk cellar', [[[entity]]], MagicMock())
+        room.update()
+
+        batch = Mock()
+        room.attach_batch(batch)
+        assert room.batch is batch
+        assert entity.batch is batch
+        assert entity.update.call_count == 1
+
+    def testAttachBatch_RoomChangedSinceLastUpdate_UpdateEntities(self):
+        entity = Mock()
+        room = Room('swing club', [[[entity]]], MagicMock())
+
+        batch = Mock()
+        room.attach_batch(batch)
+        entity.update.assert_called_once_with(
+            0, 0, 0, room.origin_x, room.origin_y, room.tile_width,
+            room.tile_height, batch)
+
+    def testEntitiesAt_GivenXYInBounds_ReturnStack(self):
+        e0, e1 = Mock(), Mock()
+        room = Room('tango hall', [[[e0, None, e1]]], MagicMock())
+
+        assert room.entities_at(0, 0) == (e0, None, e1)
+
+    def testEntitiesAt_GivenXYOutOfBounds_ReturnEmptyTuple(self):
+        room = Room('salsa bar', [[[Mock()]]], MagicMock())
+
+        assert room.entities_at(-1, 0) == ()
+        assert room.entities_at(0, 1) == ()
+
+    def testIsWalkable_AllEntitiesAtGivenXYAreWalkable_ReturnTrue(self):
         walkable_ent = Mock(walkable=True)
         entities = [[[walkable_ent, walkable_ent]]]
         portals = MagicMock()
@@ -139,7 +222,7 @@ class TestRoom(object):
 
         assert room.is_walkable(0, 0)
 
-    def TestIsWalkable_EntityAtGivenXYIsUnwalkable_ReturnFalse(self):
+    def testIsWalkable_EntityAtGivenXYIsUnwalkable_ReturnFalse(self):
         walkable_ent = Mock(walkable=True)
         unwalkable_ent = Mock(walkable=False)
         entities = [[[walkable_ent, unwalkable_ent]]]
@@ -148,14 +231,33 @@ class TestRoom(object):
 
         assert not room.is_walkable(0, 0)
 
-    def TestIsWalkable_GivenXYOutOfBounds_ReturnFalse(self):
+    def testIsWalkable_GivenXYOutOfBounds_ReturnFalse(self):
         entities = [[[Mock()]]]
         portals = MagicMock()
         room = Room('reggae shack', entities, portals)
 
         assert not room.is_walkable(0, 1)
 
-    def TestAddPortals_MappingHasHashableVals_UpdatePortalsWith2WayMap(self):
+    def testIsWalkable_UnwalkableEntityPopped_ReturnTrue(self):
+        walkable_ent = Mock(walkable=True)
+        unwalkable_ent = Mock(walkable=False)
+        entities = [[[walkable_ent, unwalkable_ent]]]
+        portals = MagicMock()
+        room = Room('dubstep den', entities, portals)
+
+        room.pop_entity(0, 0, 1)
+        assert room.is_walkable(0, 0)
+
+    def testRefreshWalkable_EntityWalkableChanged_UpdateIsWalkable(self):
+        door = Mock(walkable=False)
+        room = Room('vault', [[[door]]], MagicMock())
+        assert not room.is_walkable(0, 0)
+
+        door.walkable = True
+        room.refresh_walkable(0, 0)
+        assert room.is_walkable(0, 0)
+
+    def testAddPortals_MappingHasHashableVals_UpdatePortalsWith2WayMap(self):
         entities = MagicMock()
         portals = {}
         room = Room('generic room', entities, portals)
@@ -166,10 +268,193 @@ class TestRoom(object):
         indexed_portals.update((v, k) for (k, v) in new_portals.items())
         assert room.portals == indexed_portals
 
-    def TestAddEntity_(self):pass
+    def testAddEntity_GivenZIsOccupied_InsertAboveAndShiftStackUp(self):
+        bottom, middle, top, new = Mock(), Mock(), Mock(), Mock()
+        entities = [[[bottom, middle, None, top]]]
+        portals = MagicMock()
+        room = Room('roller rink', entities, portals)
+
+        room.add_entity(new, 0, 0, 0)
+        assert entities[0][0] == [bottom, new, middle, None, top]
+        assert sorted(room._iter_entities(), key=lambda t: t[3]) == [
+            (bottom, 0, 0, 0), (new, 0, 0, 1), (middle, 0, 0, 2),
+            (top, 0, 0, 4)]
+        middle.update.assert_called_once_with(
+            0, 0, 2, room.origin_x, room.origin_y, room.tile_width,
+            room.tile_height, room.batch)
+        bottom.update.assert_not_called()
 
-    def TestPopEntity_(self):pass
+    def testPopEntity_GivenXYZ_RemoveAndReturnEntity(self):
+        floor = Mock(walkable=True)
+        wall = Mock(walkable=False)
+        entities = [[[floor, wall]]]
+        room = Room('pool hall', entities, MagicMock())
 
-    def TestStepEntity_(self):pass
+        assert room.pop_entity(0, 0, 1) is wall
+        assert entities[0][0] == [floor, None]
+        assert list(room._iter_entities()) == [(floor, 0, 0, 0)]
+        assert room.is_walkable(0, 0)
 
-    def TestPortalEntity_(self):pass
+    def testStepEntity_NewPositionIsWalkable_MoveEntityAndFaceStep(self):
+        entity = Entity(dummy_image(), id='mover')
+        floor = Mock(walkable=True)
+        entities = [[[entity], [floor]]]
+        room = Room('hallway', entities, MagicMock())
+
+        assert room.step_entity(entity, 1, 0)
+        assert entity.facing == (1, 0)
+        assert entity.tile_pos == (1, 0, 1)
+        assert entities[0] == [[None], [floor, entity]]
+
+    def testStepEntityById_GivenId_StepUniqueEntityWithId(self):
+        entity = Entity(dummy_image(), id='mover')
+        room = Room('corridor', [[[entity], [None]]], MagicMock())
+
+        with patch.object(room, 'step_entity'):
+            room.step_entity_by_id('mover', 1, 0)
+            room.step_entity.assert_called_once_with(entity, 1, 0, None)
+
+    def testStepEntity_NewPositionIsUnwalkable_OnlyFaceStep(self):
+        entity = Entity(dummy_image())
+        wall = Mock(walkable=False)
+        entities = [[[wall]], [[entity]]]
+        room = Room('closet', entities, MagicMock())
+        room.update()
+
+        assert not room.step_entity(entity, 0, -3)
+        assert entity.facing == (0, -1)
+        assert entity.tile_pos == (0, 1, 0)
+
+    def testPortalAt_GivenXYHostsPortal_ReturnDestination(self):
+        entities = [[[None], [None]]]
+        room = Room('foyer', entities, {'cellar': (1, 0)})
+
+        assert room.portal_at(1, 0) == 'cellar'
+        assert room.portal_at(0, 0) is None
+
+    def testPortalEntity_EntityOnPortal_PopEntityAndReturnDestination(self):
+        entity = Mock(tile_z=0)
+        entities = [[[None], [entity]]]
+        room = Room('ballroom', entities, {'garden': (1, 0)})
+
+        assert room.portal_entity(entity, 1, 0) == 'garden'
+        assert entities[0][1] == [None]
+
+
+class TestWorld(object):
+
+    def make_world(self, rooms, player, start):
+        window = Mock(width=400, height=300)
+        return World(window, rooms, player, Mock(), start)
+
+    def make_hall_and_cellar(self, player):
+        hall = Room('hall', [[[Mock(walkable=True), player],
+                              [Mock(walkable=True), None]]],
+                    {'cellar': (1, 0)})
+        cellar = Room('cellar', [[[Mock(walkable=True)],
+                                  [Mock(walkable=True)]]],
+                      {'hall': (0, 0)})
+        return hall, cellar
+
+    def testClass_GivenStartRoom_FocusStartRoomAndStartPlot(self):
+        player = Entity(dummy_image())
+        hall, cellar = self.make_hall_and_cellar(player)
+        world = self.make_world({'hall': hall, 'cellar': cellar}, player,
+                                'hall')
+        assert world.player is player
+        assert world.focus is hall
+        assert hall.batch is world.batch
+        assert cellar.batch is None
+        world.plot.start.assert_called_once_with(world)
+
+    def testSetFocus_GivenRoomName_MoveBatchToGivenRoom(self):
+        player = Entity(dummy_image())
+        hall, cellar = self.make_hall_and_cellar(player)
+        world = self.make_world({'hall': hall, 'cellar': cellar}, player,
+                                'hall')
+
+        world.set_focus('cellar')
+        assert world.focus is cellar
+        assert cellar.batch is world.batch
+        assert hall.batch is None
+
+    def testSetFocus_RoomAlreadyFocused_KeepEntitiesInBatch(self):
+        player = Entity(dummy_image())
+        hall, cellar = self.make_hall_and_cellar(player)
+        world = self.make_world({'hall': hall, 'cellar': cellar}, player,
+                                'hall')
+
+        with patch.object(Entity, 'batch', new_callable=PropertyMock) as batch:
+            world.set_focus()
+            world.set_focus('hall')
+        assert batch.call_count == 0
+        assert world.focus is hall
+        assert hall.batch is world.batch
+
+    def testStepPlayer_NewPositionHostsPortal_PortalPlayerToDestination(self):
+        player = Entity(dummy_image())
+        hall, cellar = self.make_hall_and_cellar(player)
+        world = self.make_world({'hall': hall, 'cellar': cellar}, player,
+                                'hall')
+
+        world.step_player(1, 0)
+        assert world.focus is cellar
+        assert cellar.batch is world.batch
+        assert hall.batch is None
+        assert player.tile_pos == (0, 0, 1)
+        assert player in cellar.entities_at(0, 0)
+        assert player not in hall.entities_at(1, 0)
+
+    def testStepPlayer_NewPositionIsUnwalkable_StayInFocusedRoom(self):
+        player = Entity(dummy_image())
+        hall, cellar = self.make_hall_and_cellar(player)
+        world = self.make_world({'hall': hall, 'cellar': cellar}, player,
+                                'hall')
+
+        world.step_player(0, 1)
+        assert world.focus is hall
+        assert player.tile_pos == (0, 0, 1)
+
+    def make_parlor(self, player):
+        self.behind = Mock()
+        self.facing = Mock()
+        floor = Mock(action=None, walkable=True)
+        return Room('parlor', [[[self.behind], [player],
+                                [floor, self.facing]]], MagicMock())
+
+    def testInteract_EntityInFrontOfPlayer_CallEntityAction(self):
+        player = Entity(dummy_image(), facing=(1, 0))
+        world = self.make_world({'parlor': self.make_parlor(player)},
+                                player, 'parlor')
+
+        world.interact()
+        self.facing.action.assert_called_once_with(world, self.facing)
+        self.behind.action.assert_not_called()
+
+    def testOnKeyPress_SpacePressed_InteractWithFacingEntity(self):
+        player = Entity(dummy_image(), facing=(1, 0))
+        world = self.make_world({'parlor': self.make_parlor(player)},
+                                player, 'parlor')
+
+        world.on_key_press(key.SPACE, 0)
+        self.facing.action.assert_called_once_with(world, self.facing)
+
+    def testOnKeyPress_MotionKeyPressed_StepPlayer(self):
+        player = Entity(dummy_image())
+        hall, cellar = self.make_hall_and_cellar(player)
+        world = self.make_world({'hall': hall, 'cellar': cellar}, player,
+                                'hall')
+
+        world.on_key_press(key.MOTION_RIGHT, 0)
+        assert world.focus is cellar
+        assert player.facing == (1, 0)
+
+    def testOnKeyPress_KeyHasNoHandler_IgnoreKey(self):
+        player = Entity(dummy_image(), facing=(1, 0))
+        world = self.make_world({'parlor': self.make_parlor(player)},
+                                player, 'parlor')
+
+        world.on_key_press(key.A, 0)
+        assert player.tile_pos == (1, 0, 0)
+        assert player.facing == (1, 0)
+        self.facing.action.assert_not_called()
@@ -1,10 +1,9 @@
 """classes that succintly describe entity actions"""
 
-from itertools import *
-
 __all__ = [
     'AbstractAction', 'ActionIter', 'ActionLoop', 'ActionCycle',
-    'ActionSequence', 'ResetAction', 'UpdatePlot', 'Alert', 'Talk', 'Move']
+    'ActionSequence', 'ResetAction', 'UpdatePlot', 'Alert', 'Talk', 'Move',
+    'make_sequence']
 
 
 class AbstractAction(object):
@@ -13,6 +12,8 @@ class AbstractAction(object):
     All entity action classes should derive from this class.
     """
 
+    __slots__ = ()
+
     def __call__(self, world, entity):
         """Execute the action, given WorldMode object `world` and
         acting Entity object `entity`.
@@ -23,6 +24,7 @@ class AbstractAction(object):
             entity : `crystals.world.Entity`
                 The "acting" entity in the world.
         """
+        raise NotImplementedError
 
 
 class ActionIter(AbstractAction):
@@ -32,11 +34,18 @@ class ActionIter(AbstractAction):
     AbstractActionIter calls the final action in the sequence.
     """
 
+    __slots__ = ('_actions', '_last', '_i')
+
     def __init__(self, *actions):
-        self._actions = chain(actions[:-1], repeat(actions[-1]))
+        self._actions = actions
+        self._last = len(actions) - 1
+        self._i = 0
 
     def __call__(self, world, entity):
-        next(self._actions)(world, entity)
+        i = self._i
+        self._actions[i](world, entity)
+        if i < self._last:
+            self._i = i + 1
 
 
 class ActionLoop(ActionIter):
@@ -44,8 +53,17 @@ class ActionLoop(ActionIter):
     beginning once the end of the sequence is reached.
     """
 
+    __slots__ = ('_n',)
+
     def __init__(self, *actions):
-        self._actions = cycle(actions)
+        self._actions = actions
+        self._n = len(actions)
+        self._i = 0
+
+    def __call__(self, world, entity):
+        i = self._i
+        self._i = 0 if i + 1 == self._n else i + 1
+        self._actions[i](world, entity)
 
 
 class ActionCycle(AbstractAction):
@@ -53,6 +71,8 @@ class ActionCycle(AbstractAction):
     sequence N times before resting on the final action.
     """
 
+    __slots__ = ('_seq', '_len', '_i', '_final_action')
+
     def __init__(self, n, *actions):
         """Initialize the action. 
 
@@ -62,21 +82,34 @@ class ActionCycle(AbstractAction):
             `actions` : callable
                 One or more actions.
         """
-        self._actions = chain(*repeat(actions, n))
+        self._seq = actions * n
+        self._len = len(self._seq)
+        self._i = 0
         self._final_action = actions[-1]
 
     def __call__(self, world, entity):
-        try:
-            action = next(self._actions)
-        except StopIteration:
-            self._actions = repeat(self._final_action)
-            action = next(self._actions)
-        finally:
-            action(world, entity)
+        i = self._i
+        if i < self._len:
+            self._i = i + 1
+            action = self._seq[i]
+        else:
+            action = self._final_action
+        action(world, entity)
 
 
 class ActionSequence(AbstractAction):
-    """On call, calls each given action in sequence."""
+    """On call, calls each given action in sequence.
+
+    Sequences of two or three actions are created as private subclasses
+    whose ``__call__`` is unrolled.
+    """
+
+    __slots__ = ('_actions',)
+
+    def __new__(cls, *actions, **kwargs):
+        if cls is ActionSequence:
+            cls = _UNROLLED_SEQUENCES.get(len(actions), cls)
+        return super(ActionSequence, cls).__new__(cls)
 
     def __init__(self, *actions):
         self._actions = actions
@@ -86,20 +119,50 @@ class ActionSequence(AbstractAction):
             action(world, entity)
 
 
+class _ActionPair(ActionSequence):
+    """An `ActionSequence` of exactly two actions."""
+
+    __slots__ = ()
+
+    def __call__(self, world, entity):
+        a, b = self._actions
+        a(world, entity)
+        b(world, entity)
+
+
+class _ActionTriple(ActionSequence):
+    """An `ActionSequence` of exactly three actions."""
+
+    __slots__ = ()
+
+    def __call__(self, world, entity):
+        a, b, c = self._actions
+        a(world, entity)
+        b(world, entity)
+        c(world, entity)
+
+
+_UNROLLED_SEQUENCES = {2: _ActionPair, 3: _ActionTriple}
+
+
 class ResetAction(AbstractAction):
     """On call, overwrites the entity's action with the given action."""
 
+    __slots__ = ('action',)
+
     def __init__(self, action):
         self.action = action
 
     def __call__(self, world, entity):
-        entity.action = self.action
-        self.action(world, entity)
+        action = entity.action = self.action
+        action(world, entity)
 
 
 class UpdatePlot(AbstractAction):
     """On call, sends updates to the plot generator."""
 
+    __slots__ = ('updates',)
+
     def __init__(self, *updates):
         self.updates = updates
 
@@ -110,6 +173,8 @@ class UpdatePlot(AbstractAction):
 class Alert(AbstractAction):
     """On call, writes text to the infobox."""
 
+    __slots__ = ('text',)
+
     def __init__(self, text):
         self.text = text
 
@@ -120,18 +185,37 @@ class Alert(AbstractAction):
 class Talk(Alert):
     """On call, writes text to the infobox preceded by the name of the
     speaking entity.
+
+    Unlike the other actions, instances keep a ``__dict__`` so that
+    `sep` can be overridden per instance.
     """
 
     sep = ': '
 
+    def __init__(self, text, entity_name=None):
+        """Initialize the action.
+
+        :Parameters:
+            text : str
+                Text to write to the infobox.
+            entity_name : str
+                If given, always use this name for the speaker instead
+                of the name of the acting entity. The message is then
+                composed once here, using the current value of `sep`.
+        """
+        super(Talk, self).__init__(text)
+        self._msg = entity_name + self.sep + text if entity_name else None
+
     def __call__(self, world, entity):
-        text = entity.name + self.sep + self.text
-        world.infobox.write(text)
+        msg = self._msg or f'{entity.name}{self.sep}{self.text}'
+        world.infobox.write(msg)
 
 
 class Move(AbstractAction):
     """On call, move the entity a given distance from its current location."""
 
+    __slots__ = ('_x', '_y')
+
     def __init__(self, xstep, ystep):
         """Initialize the action.
 
@@ -141,8 +225,44 @@ class Move(AbstractAction):
             ystep : int
                 Number of tiles to move the entity vertically.
         """
-        self.step = (xstep, ystep)
+        self._x = xstep
+        self._y = ystep
+
+    @property
+    def step(self):
+        """Swizzle for ``xstep, ystep``."""
+        return self._x, self._y
 
     def __call__(self, world, entity):
-        world.focus.step_entity(entity, *self.step)
+        world.focus.step_entity(entity, self._x, self._y)
 
+
+class _MoveThenAlert(AbstractAction):
+    """A fused ``ActionSequence(Move(...), Alert(...))``."""
+
+    __slots__ = ('_x', '_y', 'text')
+
+    def __init__(self, move, alert):
+        self._x = move._x
+        self._y = move._y
+        self.text = alert.text
+
+    def __call__(self, world, entity):
+        world.focus.step_entity(entity, self._x, self._y)
+        world.infobox.write(self.text)
+
+
+_FUSED_SEQUENCES = {(Move, Alert): _MoveThenAlert}
+
+
+def make_sequence(*actions):
+    """Return an action that calls each of `actions` in sequence.
+
+    Known combinations of built-in actions are fused into a single
+    action that performs all of their effects in one call. Any other
+    combination produces an `ActionSequence`.
+    """
+    fused = _FUSED_SEQUENCES.get(tuple(type(a) for a in actions))
+    if fused:
+        return fused(*actions)
+    return ActionSequence(*actions)
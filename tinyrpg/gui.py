@@ -10,6 +10,11 @@ COLOR_RED = (255, 0, 0, 255)
 class Box(object):
     """An empty rectangle."""
 
+    __slots__ = ('x', 'y', 'width', 'height', 'batch', 'color', 'box',
+                 '_vertex_data', '_color_data')
+
+    _indices = (0, 1, 1, 2, 2, 3, 3, 0)
+
     def __init__(self, x, y, width, height, batch, color=COLOR_WHITE,
                  show=False):
         self.x = x
@@ -19,6 +24,11 @@ class Box(object):
         self.batch = batch
         self.color = color
 
+        x2 = x + width
+        y2 = y + height
+        self._vertex_data = ('v2i', (x, y, x, y2, x2, y2, x2, y))
+        self._color_data = ('c4B', color * 4)
+
         self.box = None
         if show:
             self.show()
@@ -32,16 +42,11 @@ class Box(object):
         """Show the box. If it's already visible, hide it first."""
         if self.visible:
             self.hide()
-        x2 = self.x + self.width
-        y2 = self.y + self.height
-        size = 8
-        vertex_data = ('v2i', (self.x, self.y, self.x, y2,
-                                    self.x, self.y, x2, self.y,
-                                    x2, self.y, x2, y2,
-                                    self.x, y2, x2, y2))
-        color_data = ('c4B', self.color * size)
-        self.box = self.batch.add(size, pyglet.gl.GL_LINES, None,
-                  vertex_data, color_data)
+        # Batches can't share GL_LINE_LOOP state, so draw the outline as
+        # indexed lines over the 4 corners
+        self.box = self.batch.add_indexed(
+            4, pyglet.gl.GL_LINES, None, self._indices, self._vertex_data,
+            self._color_data)
 
     def hide(self):
         """Hide the box. If it's already invisible, do nothing."""
@@ -56,6 +61,10 @@ class Menu(object):
     When a button is clicked, its corresponding function is called.
     """
 
+    # Event dispatchers hold weak references to their handlers
+    __slots__ = ('batch', 'functions', 'selection', 'box', 'boxes', 'labels',
+                 '_bounds', '__weakref__')
+
     def __init__(self, x, y, width, height, batch, text, functions,
                  show_box=False, margin=10, padding=10, 
                  font_name='monospace', font_size=16, bold=False,
@@ -64,38 +73,42 @@ class Menu(object):
         self.functions = functions
         self.selection = None
 
-        self.box = Box(x, y, height, batch, color, show_box)
+        self.box = Box(x, y, width, height, batch, color, show_box)
 
         # Create menu items -------------------------------------------
         # Each item is represented by a Box and a Label ---------------
         box_x = x + margin
-        box_y = y + margin
         box_width = width - (margin * 2)
-        box_height = (height / len(text)) - (margin * 2)
+        box_height = (height // len(text)) - (margin * 2)
         y_step = box_height + (margin * 2)
-        box_ycoords = reversed(range(box_y, height, y_step))
+        # Items are stacked from the top down
+        top_y = y + margin + (len(text) - 1) * y_step
 
         label_width = box_width - (padding * 2)
         label_height = box_height - (padding * 2)
-        label_x = (box_x + box_width) / 2
-        label_y = (box_y + box_height) / 2
-        label_ycoords = reversed(range(label_y, height, y_step))
+        label_x = box_x + box_width // 2
+        label_y_offset = box_height // 2
 
         self.boxes = []
         self.labels = []
-        for i, box_y, label_y in zip(
-                xrange(len(text)), box_ycoords, label_ycoords):
+        for i, item_text in enumerate(text):
+            box_y = top_y - i * y_step
             self.boxes.append(
                 Box(box_x, box_y, box_width, box_height, batch, color,
                     show=False))
 
             self.labels.append(pyglet.text.Label(
-                text[i], font_name, font_size, bold, italic, color,
-                label_x, label_y, label_width, label_height,
-                anchor_x='center', anchor_y='center',
-                halign='center', multiline=False, batch=batch))
+                item_text, font_name=font_name, font_size=font_size,
+                bold=bold, italic=italic, color=color, x=label_x,
+                y=box_y + label_y_offset, width=label_width,
+                height=label_height, anchor_x='center', anchor_y='center',
+                align='center', multiline=False, batch=batch))
             self.labels[-1].content_valign = 'center'
 
+        # Bounds of each item's box, for hit testing on mouse motion
+        self._bounds = [(box.x, box.y, box.x + box.width, box.y + box.height)
+                        for box in self.boxes]
+
         self.select_item(0)
 
     def hit_test(self, x, y, box):
@@ -117,7 +130,7 @@ class Menu(object):
             self.deselect()
             return
         if i < 0:
-            i = len(self.boxes) - i
+            i = len(self.boxes) + i
 
         self.deselect()
         self.boxes[i].show()
@@ -127,23 +140,21 @@ class Menu(object):
         """Select the next menu item in sequence.
         
         If the next index exceeds the highest item index, use the
-        lowest index in the sequence.
+        lowest index in the sequence. If no item is selected, select
+        the first item.
         """
-        if self.selection < len(self.labels) - 1:
-            self.select_item(self.selection + 1)
-        else:
-            self.select_item(0)
+        i = -1 if self.selection is None else self.selection
+        self.select_item((i + 1) % len(self.labels))
 
     def select_prev(self):
         """Select the previous menu item in sequence.
 
         If the previous index is below item index zero, use the
-        highest index in the sequence.
+        highest index in the sequence. If no item is selected, select
+        the last item.
         """
-        if self.selection > 0:
-            self.select_item(self.selection - 1)
-        else:
-            self.select_item(len(self.labels) - 1)
+        i = 0 if self.selection is None else self.selection
+        self.select_item((i - 1) % len(self.labels))
 
     def deselect(self):
         """Deselect the current menu item if it is currently selected,
@@ -155,15 +166,18 @@ class Menu(object):
 
     # event handlers ---------------------------------------------------
     def on_mouse_motion(self, x, y, dx, dy):
-        """Deselect the current menu item. Then, if the mouse is
-        positioned within the bounds of a menu item's box, select that
-        item.
+        """If the mouse is positioned within the bounds of a menu item's
+        box, select that item. Else, deselect the current menu item.
+
+        Nothing is redrawn if the selection doesn't change.
         """
-        self.deselect()
-        for box in self.boxes:
-            if self.hit_test(x, y, box):
-                self.select_item(self.boxes.index(box))
-                break 
+        hit = None
+        for i, (x1, y1, x2, y2) in enumerate(self._bounds):
+            if x1 <= x < x2 and y1 <= y < y2:
+                hit = i
+                break
+        if hit != self.selection:
+            self.select_item(hit)
 
     def on_mouse_release(self, x, y, button, modifiers):
         """On a left mouse release, if a button is currently selected,
@@ -203,5 +217,18 @@ class InfoBox(object):
         self.prefix = '> '
 
     def write(self, text):
-        self.document.insert_text(0, self.prefix + text + '\n')
+        self.document.insert_text(0, f'{self.prefix}{text}\n')
+        self.layout.ensure_line_visible(0)
+
+    def write_many(self, lines):
+        """Write each of `lines` as if by successive calls to `write`,
+        but with a single insertion into the document, so that the
+        layout is only updated once.
+
+        `lines` may be any iterable of strings.
+        """
+        prefix = self.prefix
+        lines = list(lines)
+        text = ''.join(f'{prefix}{line}\n' for line in reversed(lines))
+        self.document.insert_text(0, text)
         self.layout.ensure_line_visible(0)
@@ -1,6 +1,30 @@
 """tools for implementing plot mechanics"""
 
+def _index_triggers(triggers, index, unindexed):
+    """Add each key of `triggers` to the `index` bucket of every plot
+    state element it contains, or to `unindexed` if it contains none.
+
+    Buckets are dicts used as ordered sets, so that triggers fire in a
+    predictable order.
+    """
+    for req_state in triggers:
+        if not req_state:
+            unindexed[req_state] = None
+        for elem in req_state:
+            index.setdefault(elem, {})[req_state] = None
+
+
 def plot(world, state, triggers):
+    # Map each state element to the triggers that require it, so that
+    # an update only tests the triggers it could possibly satisfy.
+    # Triggers with no required elements are tested on every update.
+    index = {}
+    unindexed = {}
+    _index_triggers(triggers, index, unindexed)
+    # The initial state may already satisfy some triggers, so the first
+    # update tests all of them
+    checked_all = False
+
     while triggers:
         # Get state updates
         updates = (yield)
@@ -12,19 +36,38 @@ def plot(world, state, triggers):
             state.update(updates)
         else:
             state.add(updates)
+            updates = (updates,)
 
         # Call trigger functions
-        for req_state, value in triggers.items():
+        if checked_all:
+            pending = dict(unindexed)
+            for elem in updates:
+                pending.update(index.get(elem, ()))
+            pending = list(pending)
+        else:
+            pending = list(triggers)
+            checked_all = True
+        while pending:
+            req_state = pending.pop(0)
+            if req_state not in triggers or not req_state <= state:
+                continue
+
+            value = triggers.pop(req_state)
             if type(value) in (tuple, list):
                 func, nextbranch = value
             else:
                 func = value
                 nextbranch = None
+            unindexed.pop(req_state, None)
+            for elem in req_state:
+                index[elem].pop(req_state, None)
 
-            if req_state <= state:
-                func(world)
-                del triggers[req_state]
+            func(world)
+            if nextbranch:
+                # Nested triggers may already be satisfied
                 triggers.update(nextbranch)
+                _index_triggers(nextbranch, index, unindexed)
+                pending.extend(nextbranch)
 
 
 class Plot(object):
@@ -65,12 +108,21 @@ class Plot(object):
 
     @staticmethod
     def _format_triggers(triggers):
-        return dict((frozenset(k), (v[0], _format_triggers(v[1])))
-                    for k, v in triggers.iteritems())
+        """Return a copy of `triggers` with frozenset keys, in which each
+        value is a 2-tuple of a callable and its formatted nested
+        triggers.
+        """
+        formatted = {}
+        for k, v in triggers.items():
+            if callable(v):
+                formatted[frozenset(k)] = (v, {})
+            else:
+                formatted[frozenset(k)] = (v[0], Plot._format_triggers(v[1]))
+        return formatted
 
     def start(self, world):
-        self._plot = plot(world, state, triggers)
-        self._plot.next()
+        self._plot = plot(world, self.state, self.triggers)
+        next(self._plot)
 
     def update(self, *updates):
         """Update the plot state with `updates`, and call any trigger
@@ -23,17 +23,46 @@ class Loader(Loader):
         texture.height = height
         glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
 
+    def __init__(self, path=None, script_home=None):
+        super(Loader, self).__init__(path, script_home)
+        # Scaled images by name, size and transformation
+        self._scaled_images = {}
+
+    def reindex(self):
+        """Refresh the file index, and forget any scaled images."""
+        super(Loader, self).reindex()
+        self._scaled_images.clear()
+
     def image(self, name, width=None, height=None, flip_x=False, flip_y=False,
               rotate=0):
         """Load an image with an optional transformation.
 
         Extends the parent method to optionally scale the image to the
         given width and height.  If not given, no scaling will occur.
+        Scaled images are cached by name, size and transformation until
+        the loader is reindexed.
         
-        :param width int: New width of image, in pixels.
-        :param height int: New height of image, in pixels.
+        :param width int: New width of image after any transformation,
+                          in pixels.
+        :param height int: New height of image after any transformation,
+                           in pixels.
         """
-        image = super(Loader, self).image(name, flip_x, flip_y, rotate,
-                                          scale_x, scale_y)
-        if width and height:
-            self._scale_texture(image.texture, width, height)
+        if not (width and height):
+            return super(Loader, self).image(name, flip_x, flip_y, rotate)
+
+        key = (name, width, height, flip_x, flip_y, rotate)
+        image = self._scaled_images.get(key)
+        if image is None:
+            # Transform a region of its own, leaving alone the unscaled
+            # image that the parent loader caches by name.  Regions take
+            # their texture coordinates from their size, so scale last.
+            image = super(Loader, self).image(name)
+            if flip_x or flip_y or rotate:
+                image = image.get_transform(flip_x, flip_y, rotate)
+            else:
+                image = image.get_region(0, 0, image.width, image.height)
+            image.anchor_x = image.anchor_x * width // image.width
+            image.anchor_y = image.anchor_y * height // image.height
+            self._scale_texture(image, width, height)
+            self._scaled_images[key] = image
+        return image
@@ -1,5 +1,7 @@
 """build rooms from entities, and worlds from rooms"""
 
+from functools import partial
+
 import pyglet
 from pyglet.graphics import OrderedGroup
 from pyglet.window import key
@@ -18,6 +20,17 @@ ORIGIN_Y = 124
 TILE_WIDTH = 24
 TILE_HEIGHT = 24
 
+# OrderedGroup instances by z coordinate, shared by every entity in every
+# room so that entities on the same layer can be drawn together
+_GROUPS = {}
+
+def _group(z):
+    """Return the shared OrderedGroup for layer `z`."""
+    group = _GROUPS.get(z)
+    if group is None:
+        group = _GROUPS[z] = OrderedGroup(z)
+    return group
+
 class Entity(pyglet.sprite.Sprite):
     """A tangible thing in the game world.
     
@@ -26,7 +39,9 @@ class Entity(pyglet.sprite.Sprite):
             Name of the entity for display to the player.
         walkable : bool
             ``True`` if the entity can be walked upon; ``False`` if the
-            entity obstructs movement.
+            entity obstructs movement. Rooms cache walkability, so after
+            changing it call `Room.refresh_walkable` on the entity's
+            position.
         action : callable
             Object to be called if the entity is engaged with.
         facing : sequence
@@ -37,6 +52,11 @@ class Entity(pyglet.sprite.Sprite):
             to index specific entities by id.
     """
 
+    # Sprite has no __slots__, so instances keep a __dict__ for its
+    # attributes; these slots only cover what Entity adds
+    __slots__ = ('name', 'walkable', 'facing', 'action', 'id', '_tile_x',
+                 '_tile_y', '_tile_z')
+
     def __init__(self, image, name='', walkable=False, action=None,
                  facing=(0, -1), id=None, tile_x=0, tile_y=0, tile_z=0):
         """Return an Entity instance.
@@ -110,9 +130,11 @@ class Entity(pyglet.sprite.Sprite):
         self._tile_y = y
         self._tile_z = z
 
-        self.x = self._tile_x * tile_width + origin_x
-        self.y = self._tile_y * tile_height + origin_y
-        self.group = OrderedGroup(self._tile_z)
+        # Set both coordinates at once so the vertices are only
+        # recomputed once
+        super(Entity, self).update(x=x * tile_width + offset_x,
+                                   y=y * tile_height + offset_y)
+        self.group = _group(z)
         self.batch = batch
 
 
@@ -124,9 +146,28 @@ class Room(object):
                  tile_height=TILE_HEIGHT):
         self.name = name
         self._entities = entities
+        self._height = len(entities)
+        self._width = len(entities[0]) if self._height else 0
+        if any(len(row) != self._width for row in entities):
+            raise ValueError('rows of the entity grid must all have the same '
+                             'length')
+        self._walkable = [[self._is_cell_walkable(cell) for cell in row]
+                          for row in entities]
+        # Map (x, y, z) of every occupied position to its entity
+        self._occupied = {
+            (x, y, z): entity
+            for y, row in enumerate(entities)
+            for x, cell in enumerate(row)
+            for z, entity in enumerate(cell) if entity is not None}
         self.portals = {}
+        # Destination room of the portal at each position, or None
+        self._portal_map = [[None] * self._width for y in range(self._height)]
         self.add_portals(portals)
         self.batch = None
+        # update() can be skipped while the room is unchanged and still
+        # assigned to the batch it was last updated with
+        self._dirty = True
+        self._updated_batch = None
 
         # Index unique entities by instance attribute `id`
         self.uniques = {}
@@ -140,11 +181,15 @@ class Room(object):
         self.tile_height = tile_height
     
     def _iter_entities(self):
-        for y, row in enumerate(self._entities):
-            for x, cell in enumerate(row):
-                for z, entity in enumerate(cell):
-                    if entity:
-                        yield entity, x, y, z
+        for (x, y, z), entity in self._occupied.items():
+            yield entity, x, y, z
+
+    def _layout_args(self):
+        """Return the arguments that follow the coordinates in every
+        call to `Entity.update`.
+        """
+        return (self.origin_x, self.origin_y, self.tile_width,
+                self.tile_height, self.batch)
 
     def _update_entity(self, entity, x, y, z):
         """Update the entity to appear at the given coordinates.
@@ -158,17 +203,60 @@ class Room(object):
                 y coordinate of the entity.
             `z` : int
                 z coordinate of the entity.
-
-        This method should be called every time a position in the room
-        is assigned to a new Entity.
         """
-        entity.update(x, y, z, self.origin_x, self.origin_y, self.tile_width,
-                      self.tile_height, self.batch)
+        entity.update(x, y, z, *self._layout_args())
 
     def update(self):
-        """Update all entities in the room, preparing it for rendering."""
-        for entity, x, y, z in self._iter_entities():
-            self._update_entity(entity, x, y, z)
+        """Update all entities in the room, preparing it for rendering.
+
+        Does nothing if no entity has been placed or popped and the
+        batch is unchanged since the last update.
+        """
+        if not self._dirty and self.batch is self._updated_batch:
+            return
+        args = self._layout_args()
+        for (x, y, z), entity in self._occupied.items():
+            entity.update(x, y, z, *args)
+        self._dirty = False
+        self._updated_batch = self.batch
+
+    def attach_batch(self, batch):
+        """Set the room's batch and move all of its entities to it.
+
+        If `batch` is None, the entities are removed from any batch.
+        Entity positions and layers are only recomputed if the room has
+        changed since it was last updated.
+        """
+        self.batch = batch
+        if self._dirty:
+            self.update()
+            return
+        for entity in self._occupied.values():
+            entity.batch = batch
+        self._updated_batch = batch
+
+    def entities_at(self, x, y):
+        """Return a tuple of the z-stack at (x, y), from bottom to top.
+
+        Empty positions in the stack are ``None``. If (x, y) is out of
+        bounds, return an empty tuple.
+        """
+        if 0 <= y < self._height and 0 <= x < self._width:
+            return tuple(self._entities[y][x])
+        return ()
+
+    @staticmethod
+    def _is_cell_walkable(cell):
+        """Return True if all entities in the z-stack `cell` are walkable."""
+        return all(e is None or e.walkable for e in cell)
+
+    def refresh_walkable(self, x, y):
+        """Recompute the cached walkability of position (x, y).
+
+        Call this after changing the ``walkable`` attribute of an entity
+        at (x, y), e.g. when a door is opened.
+        """
+        self._walkable[y][x] = self._is_cell_walkable(self._entities[y][x])
 
     def is_walkable(self, x, y):
         """Return True if the given position is walkable.
@@ -177,10 +265,12 @@ class Room(object):
 
         A position in the room is walkable if its x and y coordinates
         are in bounds and all entities at that x and y are walkable.
+        Walkability is cached per position, and refreshed whenever an
+        entity is placed at or removed from that position, or when
+        `refresh_walkable` is called.
         """
-        return(0 <= y < len(self._entities) and
-               0 <= x < len(self._entities[y]) and
-               all(e is None or e.walkable for e in self._entities[y][x]))
+        return(0 <= y < self._height and 0 <= x < self._width and
+               self._walkable[y][x])
 
     def add_portals(self, portals):
         """Add and index the given portals.
@@ -188,12 +278,29 @@ class Room(object):
         :param portals: A mapping of destination rooms to
                         ``(x, y)`` coordinate tuples.
         """
-        self.portals.update(portals)
-        self.portals.update((v, k) for k, v in portals.items())
+        room_portals = self.portals
+        for dest, xy in portals.items():
+            room_portals[dest] = xy
+            room_portals[xy] = dest
+            x, y = xy
+            if 0 <= y < self._height and 0 <= x < self._width:
+                self._portal_map[y][x] = dest
+
+    def portal_at(self, x, y):
+        """Return the destination of the portal at (x, y), or None if
+        there is no portal there. (x, y) must be within the room.
+        """
+        return self._portal_map[y][x]
 
     def _place_entity(self, entity, x, y, z):
         """Assign coordinate point (x, y, z) to `entity`."""
         self._entities[y][x][z] = entity
+        self._dirty = True
+        if entity is not None:
+            self._occupied[x, y, z] = entity
+        else:
+            self._occupied.pop((x, y, z), None)
+        self.refresh_walkable(x, y)
 
     def add_entity(self, entity, x, y, z=None):
         """Add the given entity at (x, y, z).
@@ -204,18 +311,25 @@ class Room(object):
         entity exists at (x, y, z) place it there, else insert the
         entity at ``z + 1``.
         """
-        depth = len(self._entities[y][x])
+        stack = self._entities[y][x]
+        depth = len(stack)
         z = depth - 1 if z is None else min(depth - 1, z)
 
-        if self._entities[y][x][z]:
+        if stack[z] is not None:
             z += 1
             if z == depth:
-                self._entities[y][x].append(None)
+                stack.append(None)
             else:
-                self._entities[y][x].insert(z, None)
-                for i, ent in enumerate(self._entities[y][x][z + 1:]):
-                    if ent:
-                        self._place_entity(ent, x, y, z + 1 + i)
+                stack.insert(z, None)
+                # Entities above z have each moved up one layer
+                occupied = self._occupied
+                for new_z in range(z + 1, depth + 1):
+                    ent = stack[new_z]
+                    if ent is None:
+                        occupied.pop((x, y, new_z), None)
+                    else:
+                        occupied[x, y, new_z] = ent
+                        self._update_entity(ent, x, y, new_z)
 
         self._place_entity(entity, x, y, z)
         self._update_entity(entity, x, y, z)
@@ -223,7 +337,7 @@ class Room(object):
     def pop_entity(self, x, y, z):
         """Remove and return the entity at (x, y, z)."""
         entity = self._entities[y][x][z]
-        self._entities[y][x][z] = None
+        self._place_entity(None, x, y, z)
         return entity
     
     def step_entity(self, entity, xstep, ystep, z=None):
@@ -232,9 +346,8 @@ class Room(object):
         If the new position isn't walkable, nothing happens.
 
         :Parameters:
-            entity : Entity or str
-                The entity to move. If a string is given, use the
-                unique entity with that id.
+            entity : Entity
+                The entity to move.
             xstep : int
                 X distance to move. Positive values move the entity
                 right and negative values left.
@@ -245,23 +358,28 @@ class Room(object):
         :returns: True if the move succeeded, False otherwise.
         :rtype: bool
         """
-        if type(entity) is str:
-            entity = self.uniques[entity]
-
-        entity.facing = (xstep / abs(xstep) if xstep else 0,
-                         ystep / abs(ystep) if ystep else 0)
+        entity.facing = ((xstep > 0) - (xstep < 0), (ystep > 0) - (ystep < 0))
 
-        newx = entity.tile_x + xstep
-        newy = entity.tile_y + ystep
+        x, y, old_z = entity.tile_pos
+        newx = x + xstep
+        newy = y + ystep
         if not self.is_walkable(newx, newy):
             return False
 
         if z is None:
-            z = entity.tile_z
-        self.pop_entity(x, y, z)
+            z = old_z
+        self.pop_entity(x, y, old_z)
         self.add_entity(entity, newx, newy, z)
         return True
 
+    def step_entity_by_id(self, entity_id, xstep, ystep, z=None):
+        """Move the unique entity with the given id a given distance
+        from its current position.
+
+        See `step_entity`.
+        """
+        return self.step_entity(self.uniques[entity_id], xstep, ystep, z)
+
     def portal_entity(self, entity, x, y):
         """Portal the entity from its current given position.
 
@@ -275,17 +393,18 @@ class Room(object):
         
         The given coordinates must host both the given entity and a
         portal.
+
+        :returns: The name of the portal's destination room.
+        :rtype: str
         """
-        from_room = self.focus.name
-        dest = self.portals[(x, y)]
         self.pop_entity(x, y, entity.tile_z)
-        x, y = self.portals[self.focus.name]
+        return self._portal_map[y][x]
 
 
 class World(GameMode):
     """Player explores a collection of `Room` objects."""
 
-    def __init__(self, window, rooms, player, plot):
+    def __init__(self, window, rooms, player, plot, start):
         super(World, self).__init__(window)
 
         self._rooms = rooms
@@ -302,12 +421,12 @@ class World(GameMode):
             ib_x, ib_y, ib_width, ib_height, self.batch, show_box=True,
             style=ib_style)
 
-        self.key_switch = {
-            key.MOTION_LEFT: (self.step_player, -1, 0),
-            key.MOTION_RIGHT: (self.step_player, 1, 0),
-            key.MOTION_DOWN: (self.step_player, 0, -1),
-            key.MOTION_UP: (self.step_player, 0, 1),
-            key.SPACE: (self.interact,),
+        self._key_handlers = {
+            key.MOTION_LEFT: partial(self.step_player, -1, 0),
+            key.MOTION_RIGHT: partial(self.step_player, 1, 0),
+            key.MOTION_DOWN: partial(self.step_player, 0, -1),
+            key.MOTION_UP: partial(self.step_player, 0, 1),
+            key.SPACE: self.interact,
         }
 
         self._focus = None
@@ -328,14 +447,18 @@ class World(GameMode):
         :type room: str
         
         If rooms tests false, just redraw the currently focused room.
+        The focused room keeps its batch, so redrawing it only updates
+        entities that changed.
         """
-        if self.focus:
-            self.focus.batch = None
-            self.focus.update()
+        focus = self.focus
+        room = self[room] if room else focus
+        if room is focus:
+            room.update()
+            return
 
-        room = self[room] if room else self.focus
-        room.batch = self.batch
-        room.update()
+        if focus:
+            focus.attach_batch(None)
+        room.attach_batch(self.batch)
         self._focus = room
 
     def step_player(self, xstep, ystep):
@@ -352,37 +475,42 @@ class World(GameMode):
         If successful and the new position hosts a portal, portal
         the player.
         """
-        if not self.step_entity(self.player, xstep, ystep):
+        focus = self.focus
+        player = self.player
+        if not focus.step_entity(player, xstep, ystep):
             return
 
-        from_room = self.focus.name
-        x, y, z = self.player.tile_pos
-        if (x, y) in self.focus.portals:
+        x = player.tile_x
+        y = player.tile_y
+        if focus.portal_at(x, y) is not None:
             self.portal_player(x, y)
 
     def portal_player(self, x, y):
         """Portal the player from its position at the given coordinates.
         
-        The given coordinates should"""
-        if not self.portal_entity(self.player, x, y):
-            return
+        The player is placed in the destination room at the portal that
+        leads back to the current room, and that room gains focus.
+        """
         from_room = self.focus.name
-        dest = self.portals[from_room][(x, y)]
+        dest = self.focus.portal_entity(self.player, x, y)
+        dest_x, dest_y = self[dest].portals[from_room]
+        self[dest].add_entity(self.player, dest_x, dest_y,
+                              self.player.tile_z)
         self.set_focus(dest)
 
     def interact(self):
         """If an interactable entity is in front of the player, make
         her interact with it. Else, do nothing.
         """
-        x, y, z = self.player.tile_pos
-        x += self.player.facing[0]
-        y += self.player.facing[1]
-        for entity in self.focus[y][x]:
-            if entity and entity.action:
+        player = self.player
+        facing_x, facing_y = player.facing
+        for entity in self.focus.entities_at(player.tile_x + facing_x,
+                                             player.tile_y + facing_y):
+            if entity is not None and entity.action:
                 entity.action(self, entity)
 
     def on_key_press(self, key, modifiers):
         """Process user input."""
-        if key not in self.key_switch:
-            return
-        self.key_switch[key][0](*self.key_switch[key][1:])
+        handler = self._key_handlers.get(key)
+        if handler:
+            handler()